@@ -2,31 +2,144 @@
 #
 # Notes:
 # - Requires MicroPython firmware for Pico W.
-# - You will likely need the "urequests.py" module copied onto the Pico.
+# - Uses the built-in socket/ssl modules directly (no urequests needed).
 # - Also ensure "neopixel" module is available (it is included in most Pico builds).
 
+import os
+import json
 import time
 import math
+import array
 import random
+import socket
 
 import network
 import ntptime
 
 try:
-    import urequests as requests
+    import ussl as ssl
 except ImportError:
-    # Fallback name on some builds
-    import requests
+    import ssl
 
 from machine import Pin
 import neopixel
 
+try:
+    import rp2
+except ImportError:
+    # Non-RP2040 build; fall back to the bit-banged neopixel driver
+    rp2 = None
+
 import config
 
+# ===== Precomputed constants =====
+# The animation loop runs every 20ms; on MicroPython each config.X access is a
+# module attribute lookup and the breathing math redoes the same arithmetic
+# every frame. Resolve all of it once at import time instead.
+
+_LED_COUNT = config.LED_COUNT
+_USE_SUN_TIMES = config.USE_SUN_TIMES
+_UTC_OFFSET_SEC = int(config.UTC_OFFSET_HOURS) * 3600
+_UPDATE_INTERVAL_MS = config.UPDATE_INTERVAL_SECONDS * 1000
+_SUN_REFRESH_MS = config.SUN_TIMES_REFRESH_SECONDS * 1000
+_ENABLE_GUST_BREATHING = config.ENABLE_GUST_BREATHING
+_ENABLE_LIGHTNING_EFFECT = config.ENABLE_LIGHTNING_EFFECT
+_LIGHTNING_FREQUENCY = config.LIGHTNING_FREQUENCY
+_LIGHTNING_BRIGHTNESS = config.LIGHTNING_BRIGHTNESS
+_BREATH_MIN = config.GUST_BREATH_MIN
+_BREATH_SPAN = config.GUST_BREATH_MAX - config.GUST_BREATH_MIN
+
+# 64-entry eased-breath table covering one full breath cycle, scaled 0-255.
+# sin() and the **2.5 easing are thousands of cycles each on the RP2040's
+# soft-float; paying them 64 times at import leaves an index per frame.
+_BREATH_LUT = bytes(
+    int(255 * (_BREATH_MIN + _BREATH_SPAN *
+               (((math.sin(2 * math.pi * i / 64) + 1.0) / 2.0) ** 2.5)))
+    for i in range(64)
+)
+_BREATH_STEP_MS = int(config.GUST_BREATH_PERIOD_SEC * 1000 // 64)
+
+# ===== WS2812 driver =====
+# The stock neopixel module bit-bangs the data line with interrupts off,
+# blocking the CPU for ~30us per LED on every write. The RP2040's PIO can
+# generate the 800kHz waveform itself, and with DMA feeding the TX FIFO
+# write() returns as soon as the transfer is queued.
+
+if rp2:
+
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, out_shiftdir=rp2.PIO.SHIFT_LEFT,
+                 autopull=True, pull_thresh=24)
+    def _ws2812_pio():
+        # WS2812 timing from the RP2040 datasheet PIO example:
+        # 10 cycles per bit at 8MHz = 1.25us.
+        T1 = 2
+        T2 = 5
+        T3 = 3
+        wrap_target()
+        label("bitloop")
+        out(x, 1).side(0)[T3 - 1]
+        jmp(not_x, "do_zero").side(1)[T1 - 1]
+        jmp("bitloop").side(1)[T2 - 1]
+        label("do_zero")
+        nop().side(0)[T2 - 1]
+        wrap()
+
+    _PIO0_TXF0 = 0x50200010  # PIO0 TX FIFO 0 register, the DMA write target
+
+    class PioNeoPixel:
+        """
+        Drop-in stand-in for neopixel.NeoPixel backed by a PIO state machine.
+        Exposes the same .buf (GRB byte triplets) and .write() the rest of
+        the code uses.
+        """
+
+        def __init__(self, pin, n):
+            self.n = n
+            self.buf = bytearray(n * 3)
+            # One 32-bit word per LED with GRB in the top 24 bits, matching
+            # the SHIFT_LEFT / pull_thresh=24 program above.
+            self._words = array.array("I", [0] * n)
+            self._sm = rp2.StateMachine(0, _ws2812_pio, freq=8000000,
+                                        sideset_base=pin)
+            self._sm.active(1)
+            try:
+                self._dma = rp2.DMA()
+            except AttributeError:
+                # Firmware without the rp2.DMA API; use blocking FIFO puts.
+                self._dma = None
+
+        def write(self):
+            if self._dma:
+                # Let an in-flight transfer drain before repacking the words.
+                while self._dma.active():
+                    pass
+            buf = self.buf
+            words = self._words
+            for i in range(self.n):
+                j = 3 * i
+                words[i] = (buf[j] << 24) | (buf[j + 1] << 16) | (buf[j + 2] << 8)
+            if self._dma:
+                ctrl = self._dma.pack_ctrl(size=2, inc_read=True,
+                                           inc_write=False, treq_sel=0)
+                self._dma.config(read=words, write=_PIO0_TXF0,
+                                 count=self.n, ctrl=ctrl, trigger=True)
+            else:
+                self._sm.put(words)
+
+
 # ===== Global state =====
 
-np = neopixel.NeoPixel(Pin(config.LED_PIN, Pin.OUT), config.LED_COUNT)
+if rp2:
+    np = PioNeoPixel(Pin(config.LED_PIN, Pin.OUT), config.LED_COUNT)
+else:
+    np = neopixel.NeoPixel(Pin(config.LED_PIN, Pin.OUT), config.LED_COUNT)
+
+# Copy of the last frame actually transmitted to the ring; lets us skip the
+# blocking WS2812 transmit entirely when nothing changed.
+_last_buf = bytearray(len(np.buf))
 
+# time.ticks_ms() stamps: monotonic (an NTP resync can't jump them) and
+# cheaper to compare than time.time() in the frame loop.
 last_metar_update = 0
 last_sun_update = 0
 
@@ -75,39 +188,234 @@ def sync_time():
         log("NTP sync failed: {}".format(e))
 
 
+# ===== HTTP (keep-alive) =====
+# urequests opens, TLS-handshakes, and closes a fresh connection on every
+# request. Both endpoints here get polled forever, so keep one socket open
+# per host and reuse it across polls; the TLS handshake to the sun API is
+# by far the most expensive part of that call on a Pico W.
+
+_http_sockets = {}
+
+
+def _split_url(url):
+    """
+    Split a URL into (use_ssl, host, port, path).
+    """
+    if url.startswith("https://"):
+        use_ssl = True
+        rest = url[8:]
+    elif url.startswith("http://"):
+        use_ssl = False
+        rest = url[7:]
+    else:
+        raise ValueError("Unsupported URL: {}".format(url))
+    if "/" in rest:
+        host, path = rest.split("/", 1)
+        path = "/" + path
+    else:
+        host = rest
+        path = "/"
+    port = 443 if use_ssl else 80
+    if ":" in host:
+        host, port_str = host.split(":", 1)
+        port = int(port_str)
+    return use_ssl, host, port, path
+
+
+def _close_http_socket(key):
+    sock = _http_sockets.pop(key, None)
+    if sock:
+        try:
+            sock.close()
+        except Exception:
+            pass
+
+
+def _get_http_socket(key, timeout):
+    sock = _http_sockets.get(key)
+    if sock is None:
+        use_ssl, host, port = key
+        addr = socket.getaddrinfo(host, port)[0][-1]
+        raw = socket.socket()
+        raw.settimeout(timeout)
+        raw.connect(addr)
+        if use_ssl:
+            sock = ssl.wrap_socket(raw, server_hostname=host)
+        else:
+            sock = raw
+        _http_sockets[key] = sock
+    return sock
+
+
+def _read_exact(sock, length):
+    body = b""
+    while len(body) < length:
+        chunk = sock.read(length - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return body
+
+
+def _read_last_line(sock, length=None):
+    # Stream a body line by line, keeping only the last non-empty line.
+    # Avoids ever holding the full response (plus a copy from .decode) on
+    # the heap; the METAR TXT endpoint is header lines + one report line.
+    last = b""
+    remaining = length
+    while remaining is None or remaining > 0:
+        line = sock.readline()
+        if not line:
+            break
+        if remaining is not None:
+            remaining -= len(line)
+        stripped = line.strip()
+        if stripped:
+            last = stripped
+    return last
+
+
+def _read_chunked(sock):
+    body = b""
+    while True:
+        size_line = sock.readline()
+        size = int(size_line.split(b";")[0], 16)
+        if size == 0:
+            sock.readline()  # trailing CRLF after last chunk
+            return body
+        body += _read_exact(sock, size)
+        sock.readline()  # CRLF after each chunk
+
+
+def _read_response_headers(sock):
+    """
+    Read the status line and headers.
+    Returns (status_code, content_length, chunked, keep_alive).
+    """
+    line = sock.readline()
+    if not line:
+        raise OSError("connection closed by server")
+    status = int(line.split(b" ", 2)[1])
+    length = None
+    chunked = False
+    keep_alive = True
+    while True:
+        line = sock.readline()
+        if not line or line == b"\r\n":
+            break
+        lower = line.lower()
+        if lower.startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+        elif lower.startswith(b"transfer-encoding:") and b"chunked" in lower:
+            chunked = True
+        elif lower.startswith(b"connection:") and b"close" in lower:
+            keep_alive = False
+    return status, length, chunked, keep_alive
+
+
+def _http_request(url, timeout=10, headers=None, last_line=False):
+    """
+    GET over a persistent keep-alive socket.
+    Returns (status_code, body_bytes), or (None, None) on network failure.
+
+    With last_line=True the body is streamed line by line and only the last
+    non-empty line is kept, instead of buffering the whole response.
+    """
+    use_ssl, host, port, path = _split_url(url)
+    key = (use_ssl, host, port)
+    # Two attempts so a socket the server closed between polls is simply
+    # reconnected instead of failing the whole poll.
+    for attempt in range(2):
+        try:
+            sock = _get_http_socket(key, timeout)
+            req = "GET {} HTTP/1.1\r\nHost: {}\r\nConnection: keep-alive\r\n".format(
+                path, host
+            )
+            if headers:
+                for name in headers:
+                    req += "{}: {}\r\n".format(name, headers[name])
+            req += "\r\n"
+            sock.write(req.encode())
+            status, length, chunked, keep_alive = _read_response_headers(sock)
+            if status == 304 or status == 204 or status < 200:
+                # 304/204/1xx responses carry no body regardless of framing
+                # headers (RFC 7230); trying to read one here would block
+                # until the socket timeout and kill the keep-alive socket.
+                body = b""
+            elif chunked:
+                body = _read_chunked(sock)
+                if last_line:
+                    body = body.strip().split(b"\n")[-1].strip()
+            elif length is not None:
+                if last_line:
+                    body = _read_last_line(sock, length)
+                else:
+                    body = _read_exact(sock, length)
+            else:
+                # No framing info: read until close; socket can't be reused.
+                if last_line:
+                    body = _read_last_line(sock)
+                else:
+                    body = b""
+                    while True:
+                        chunk = sock.read(512)
+                        if not chunk:
+                            break
+                        body += chunk
+                keep_alive = False
+            if not keep_alive:
+                _close_http_socket(key)
+            return status, body
+        except Exception as e:
+            log("HTTP error for {}: {}".format(url, e))
+            _close_http_socket(key)
+    return None, None
+
+
+def _request_with_backoff(url, timeout=10, headers=None, last_line=False,
+                          max_retries=3, base=1.0, cap=30.0):
+    """
+    _http_request with exponential backoff plus jitter, so a transient
+    network blip doesn't blank the lamp for a whole update interval.
+    Retries network failures and 5xx; a definitive answer (2xx/3xx/4xx)
+    is returned immediately.
+    """
+    attempt = 0
+    while True:
+        status, body = _http_request(url, timeout, headers, last_line)
+        if status is not None and status < 500:
+            return status, body
+        if attempt >= max_retries:
+            return status, body
+        delay = min(cap, base * (2 ** attempt) * (1 + random.random() * 0.5))
+        log("HTTP retry {}/{} in {:.1f}s".format(attempt + 1, max_retries, delay))
+        time.sleep(delay)
+        attempt += 1
+
+
 def http_get_json(url, timeout=10):
     log("GET {}".format(url))
-    resp = None
+    status, body = _request_with_backoff(url, timeout)
+    if status != 200 or body is None:
+        log("HTTP JSON error: status {}".format(status))
+        return None
     try:
-        resp = requests.get(url, timeout=timeout)
-        data = resp.json()
-        resp.close()
-        return data
+        return json.loads(body)
     except Exception as e:
         log("HTTP JSON error: {}".format(e))
-        try:
-            if resp:
-                resp.close()
-        except Exception:
-            pass
         return None
 
 
 def http_get_text(url, timeout=10):
     log("GET {}".format(url))
-    resp = None
+    status, body = _request_with_backoff(url, timeout)
+    if status != 200 or body is None:
+        log("HTTP text error: status {}".format(status))
+        return None
     try:
-        resp = requests.get(url, timeout=timeout)
-        text = resp.text
-        resp.close()
-        return text
+        return body.decode()
     except Exception as e:
         log("HTTP text error: {}".format(e))
-        try:
-            if resp:
-                resp.close()
-        except Exception:
-            pass
         return None
 
 
@@ -116,6 +424,19 @@ def iso_time_to_seconds_since_midnight(iso_str):
     Convert an ISO 8601 timestamp string to seconds since midnight (UTC) for that day.
     Example: "2025-11-29T13:05:23+00:00"
     """
+    # Fast path: the sunrise-sunset API always returns the strict
+    # "YYYY-MM-DDTHH:MM:SS..." layout, so the time digits sit at fixed
+    # offsets and can be sliced out with no intermediate strings.
+    if (len(iso_str) >= 19 and iso_str[10] == "T"
+            and iso_str[13] == ":" and iso_str[16] == ":"):
+        try:
+            return (int(iso_str[11:13]) * 3600
+                    + int(iso_str[14:16]) * 60
+                    + int(iso_str[17:19]))
+        except ValueError:
+            pass
+
+    # Tolerant fallback for anything else
     try:
         # Split off timezone offset
         if "T" not in iso_str:
@@ -150,6 +471,10 @@ def update_sun_times():
     if not config.USE_SUN_TIMES:
         return
 
+    # Stamp the attempt up front so a failing sun API doesn't get re-polled
+    # (with backoff) on every slow tick; see update_metar_state.
+    last_sun_update = time.ticks_ms()
+
     url = "https://api.sunrise-sunset.org/json?lat={}&lng={}&formatted=0".format(
         config.LATITUDE, config.LONGITUDE
     )
@@ -168,10 +493,8 @@ def update_sun_times():
     sr_utc = iso_time_to_seconds_since_midnight(sr_iso)
     ss_utc = iso_time_to_seconds_since_midnight(ss_iso)
 
-    offset = int(config.UTC_OFFSET_HOURS)
-    sunrise_sec_local = (sr_utc + offset * 3600) % 86400
-    sunset_sec_local = (ss_utc + offset * 3600) % 86400
-    last_sun_update = time.time()
+    sunrise_sec_local = (sr_utc + _UTC_OFFSET_SEC) % 86400
+    sunset_sec_local = (ss_utc + _UTC_OFFSET_SEC) % 86400
 
     log("Sunrise local sec: {}, sunset local sec: {}".format(
         sunrise_sec_local, sunset_sec_local
@@ -182,15 +505,14 @@ def get_local_seconds_of_day():
     # MicroPython time.localtime() is UTC by default; apply offset
     t = time.localtime()
     utc_sec = t[3] * 3600 + t[4] * 60 + t[5]
-    offset = int(config.UTC_OFFSET_HOURS)
-    local_sec = (utc_sec + offset * 3600) % 86400
+    local_sec = (utc_sec + _UTC_OFFSET_SEC) % 86400
     return local_sec
 
 
-def current_brightness():
+def _compute_brightness():
     if not config.USE_SUN_TIMES:
         # fallback fixed-day assumption
-        hour = time.localtime()[3] + int(config.UTC_OFFSET_HOURS)
+        hour = time.localtime()[3] + _UTC_OFFSET_SEC // 3600
         if hour < 0:
             hour += 24
         elif hour >= 24:
@@ -216,139 +538,211 @@ def current_brightness():
             return config.NIGHT_BRIGHTNESS
 
 
+# Day/night brightness only changes twice a day, but the animation loop asks
+# 50 times a second and each ask costs a time.localtime() tuple; cache the
+# answer for a minute.
+_bright_cache = config.DAY_BRIGHTNESS
+_bright_cache_ms = None
+
+
+def current_brightness():
+    global _bright_cache, _bright_cache_ms
+    now = time.ticks_ms()
+    if _bright_cache_ms is not None and time.ticks_diff(now, _bright_cache_ms) < 60000:
+        return _bright_cache
+    _bright_cache = _compute_brightness()
+    _bright_cache_ms = now
+    return _bright_cache
+
+
 # ===== METAR handling =====
 
+# Last successfully fetched METAR, mirrored to flash so a reboot inside the
+# update interval can skip the network round-trip. METARs are only issued
+# hourly, so most polls return the same report anyway.
+_METAR_CACHE_FILE = "/metar_cache.txt"
+_cached_metar_time = 0
+_cached_metar_text = None
+
+_HTTP_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_HTTP_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(t):
+    # RFC 1123 date for If-Modified-Since, e.g. "Sat, 29 Nov 2025 13:05:23 GMT"
+    tm = time.gmtime(t)
+    return "{}, {:02d} {} {} {:02d}:{:02d}:{:02d} GMT".format(
+        _HTTP_WEEKDAYS[tm[6]], tm[2], _HTTP_MONTHS[tm[1] - 1], tm[0],
+        tm[3], tm[4], tm[5]
+    )
+
+
+def _load_metar_cache():
+    global _cached_metar_time, _cached_metar_text
+    try:
+        with open(_METAR_CACHE_FILE) as f:
+            stamp = f.readline().strip()
+            metar = f.readline().strip()
+        if not stamp or not metar:
+            return False
+        _cached_metar_time = int(stamp)
+        _cached_metar_text = metar
+        return True
+    except Exception:
+        return False
+
+
+def _save_metar_cache(metar):
+    try:
+        with open(_METAR_CACHE_FILE, "w") as f:
+            f.write("{}\n{}\n".format(int(_cached_metar_time), metar))
+    except Exception as e:
+        log("Failed to write METAR cache: {}".format(e))
+
+
 def fetch_metar(icao):
+    global _cached_metar_time, _cached_metar_text
+
     url = "https://tgftp.nws.noaa.gov/data/observations/metar/stations/{}.TXT".format(
         icao.upper()
     )
-    text = http_get_text(url)
-    if not text:
+    headers = None
+    if _cached_metar_text and _cached_metar_time:
+        headers = {"If-Modified-Since": _http_date(_cached_metar_time)}
+
+    log("GET {}".format(url))
+    # The TXT body is a timestamp line plus the raw METAR; stream it and
+    # keep only the last line rather than buffering the whole response.
+    status, body = _request_with_backoff(url, headers=headers, last_line=True)
+
+    if status == 304:
+        # Station hasn't issued a new report; reuse the cached one.
+        log("METAR not modified; using cached report")
+        _cached_metar_time = int(time.time())
+        return _cached_metar_text
+
+    if status != 200 or not body:
+        log("METAR fetch failed: status {}".format(status))
         return None
-    lines = text.strip().splitlines()
-    if not lines:
+
+    try:
+        metar = body.decode()
+    except Exception:
         return None
-    # Last line is the raw METAR
-    return lines[-1].strip()
+
+    _cached_metar_time = int(time.time())
+    if metar != _cached_metar_text:
+        _cached_metar_text = metar
+        # Only hit flash when the report actually changed.
+        _save_metar_cache(metar)
+    return metar
 
 
-def parse_visibility_sm(tokens):
+def parse_metar(tokens, raw):
     """
-    Parse visibility in statute miles from METAR tokens.
-    Looks for tokens with 'SM'. Handles simple patterns like:
-    '10SM', '5SM', '3/4SM', '1 1/2SM', 'P6SM', 'M1/4SM'
-    Returns float (SM) or None.
+    Parse a METAR in a single pass over its tokens.
+    Returns (visibility_sm, ceiling_ft, sustained_wind_kt, has_gusts, has_lightning).
+
+    Each token is dispatched once by its suffix/prefix (wind ends in 'KT',
+    visibility in 'SM', cloud layers start BKN/OVC/VV) instead of scanning
+    the whole token list separately for each field.
     """
     vis = None
+    ceiling_ft = None
+    sustained = 0
+    gust = False
+    wind_done = False
+
     for i, tok in enumerate(tokens):
-        if "SM" not in tok:
+        if not tok:
             continue
-        raw = tok.replace("SM", "")
-
-        whole = 0.0
-        frac = 0.0
-
-        # Handle patterns like 'P6' (greater than 6) or 'M1/4'
-        greater = raw.startswith("P")
-        less_than = raw.startswith("M")
-        if greater or less_than:
-            raw = raw[1:]
-
-        # Sometimes whole number and fraction are split: '1' '1/2SM'
-        prev = tokens[i - 1] if i > 0 else ""
-        if "/" in raw and prev.isdigit():
-            whole = float(prev)
-            frac_num, frac_den = raw.split("/", 1)
-            try:
-                frac = float(frac_num) / float(frac_den)
-            except Exception:
-                frac = 0.0
-        elif "/" in raw:
-            # fraction only, like '1/2'
-            try:
-                num, den = raw.split("/", 1)
-                frac = float(num) / float(den)
-            except Exception:
-                frac = 0.0
-        elif raw.strip() != "":
-            # whole number only
+        last = tok[-1]
+
+        # Wind: 18012G20KT, 09005KT, VRB03KT
+        if (not wind_done and last == "T" and tok.endswith("KT")
+                and ("G" in tok or tok[0:3].isdigit() or tok.startswith("VRB"))):
+            body = tok[:-2]  # drop 'KT'
+            body = body[3:]  # strip dir or 'VRB'
+            if "G" in body:
+                spd = body.split("G", 1)[0]
+                gust = True
+            else:
+                spd = body
             try:
-                whole = float(raw)
+                sustained = int(spd)
             except Exception:
-                whole = 0.0
-
-        value = whole + frac
+                sustained = 0
+            wind_done = True
+
+        # Visibility: '10SM', '5SM', '3/4SM', '1 1/2SM', 'P6SM', 'M1/4SM'
+        elif vis is None and last == "M" and tok.endswith("SM"):
+            # The grammar is tiny (optional P/M prefix, digits, optional
+            # fraction), so walk the characters directly instead of paying
+            # for replace()/split()/float() allocations on every parse.
+            body = tok[:-2]
+
+            # Handle patterns like 'P6' (greater than 6) or 'M1/4'
+            greater = False
+            less_than = False
+            if body:
+                if body[0] == "P":
+                    greater = True
+                    body = body[1:]
+                elif body[0] == "M":
+                    less_than = True
+                    body = body[1:]
+
+            num = 0
+            den = 0
+            in_frac = False
+            valid = bool(body)
+            for ch in body:
+                o = ord(ch)
+                if 48 <= o <= 57:  # '0'..'9'
+                    if in_frac:
+                        den = den * 10 + (o - 48)
+                    else:
+                        num = num * 10 + (o - 48)
+                elif ch == "/" and not in_frac:
+                    in_frac = True
+                else:
+                    valid = False
+                    break
+
+            if not valid:
+                value = 0.0
+            elif in_frac:
+                # Sometimes whole number and fraction are split: '1' '1/2SM'
+                prev = tokens[i - 1] if i > 0 else ""
+                whole = int(prev) if prev.isdigit() else 0
+                value = whole + (num / den if den else 0.0)
+            else:
+                value = float(num)
 
-        if greater:
-            # 'P6SM' etc → treat as 10SM
-            if value <= 0:
+            if greater and value <= 0:
+                # 'P6SM' etc → treat as 10SM
                 value = 10.0
-        if less_than:
-            # 'M1/4SM' → treat as 0.25SM
-            if value <= 0:
+            if less_than and value <= 0:
+                # 'M1/4SM' → treat as 0.25SM
                 value = 0.25
 
-        vis = value
-        break
-
-    return vis
-
+            vis = value
 
-def parse_ceiling_ft(tokens):
-    """
-    Find lowest ceiling (BKN/OVC/VV) in feet.
-    Returns int feet or None.
-    """
-    ceiling_ft = None
-    for tok in tokens:
-        if tok.startswith("BKN") or tok.startswith("OVC") or tok.startswith("VV"):
+        # Ceiling: lowest BKN/OVC/VV layer
+        elif tok.startswith("BKN") or tok.startswith("OVC") or tok.startswith("VV"):
             if len(tok) >= 6:
                 height_part = tok[3:6]
                 if height_part.isdigit():
                     h = int(height_part) * 100
                     if ceiling_ft is None or h < ceiling_ft:
                         ceiling_ft = h
-    return ceiling_ft
-
-
-def parse_wind(tokens):
-    """
-    Parse sustained wind speed and gust presence from METAR tokens.
-    Returns (sustained_knots, has_gusts)
-    """
-    sustained = 0
-    gust = False
-    for tok in tokens:
-        if tok.endswith("KT") and ("G" in tok or tok[0:3].isdigit() or tok.startswith("VRB")):
-            # Example: 18012G20KT, 09005KT, VRB03KT
-            body = tok[:-2]  # drop 'KT'
-            # Remove optional unit 'KT' already removed, handle VRB
-            if body.startswith("VRB"):
-                body = body[3:]
-            else:
-                body = body[3:]  # strip dir
-            if "G" in body:
-                parts = body.split("G", 1)
-                spd = parts[0]
-                gspd = parts[1]
-                gust = True
-            else:
-                spd = body
-            try:
-                sustained = int(spd)
-            except Exception:
-                sustained = 0
-            break
-    return sustained, gust
 
+    # Lightning: 'VCTS' contains 'TS', so two substring checks cover
+    # TS / VCTS / LTG
+    lightning = "TS" in raw or "LTG" in raw
 
-def has_lightning_from_metar(metar):
-    """
-    Very simple detection: look for TS, VCTS, or LTG in the METAR.
-    """
-    if "TS" in metar or "VCTS" in metar or "LTG" in metar:
-        return True
-    return False
+    return vis, ceiling_ft, sustained, gust, lightning
 
 
 def classify_flight_category(ceiling_ft, visibility_sm):
@@ -370,22 +764,14 @@ def classify_flight_category(ceiling_ft, visibility_sm):
         return "VFR"
 
 
-def update_metar_state():
-    global last_metar_update, flight_category, has_gusts, has_lightning, sustained_wind_kt
-
-    metar = fetch_metar(config.AIRPORT_ICAO)
-    if not metar:
-        log("Failed to fetch METAR")
-        return
-
-    log("METAR: {}".format(metar))
+def apply_metar_state(metar):
+    global flight_category, has_gusts, has_lightning, sustained_wind_kt
 
     tokens = metar.split()
 
-    vis_sm = parse_visibility_sm(tokens)
-    ceil_ft = parse_ceiling_ft(tokens)
-    sustained_wind_kt, gust_flag = parse_wind(tokens)
-    lightning_flag = has_lightning_from_metar(metar)
+    vis_sm, ceil_ft, sustained_wind_kt, gust_flag, lightning_flag = parse_metar(
+        tokens, metar
+    )
 
     cat = classify_flight_category(ceil_ft, vis_sm)
 
@@ -393,96 +779,190 @@ def update_metar_state():
     has_gusts = gust_flag
     has_lightning = lightning_flag
 
-    last_metar_update = time.time()
-
     log("Category: {}, vis: {} SM, ceil: {} ft, wind: {} kt, gusts: {}, lightning: {}".format(
         flight_category, vis_sm, ceil_ft, sustained_wind_kt, has_gusts, has_lightning
     ))
 
 
+def update_metar_state():
+    global last_metar_update
+
+    # Stamp the attempt up front: if the fetch fails even after its backoff
+    # retries, the lamp should animate normally until the next scheduled
+    # interval instead of re-running the whole backoff every slow tick.
+    last_metar_update = time.ticks_ms()
+
+    metar = fetch_metar(config.AIRPORT_ICAO)
+    if not metar:
+        # Keep showing whatever state we already have (cached or live)
+        # instead of going dark until the next interval.
+        log("Failed to fetch METAR; keeping previous state")
+        return
+
+    log("METAR: {}".format(metar))
+    apply_metar_state(metar)
+
+
 # ===== LED / animation =====
 
+# One hashed lookup instead of a chain of string compares per call
+_CAT_COLOR = {
+    "VFR": config.COLOR_VFR,
+    "MVFR": config.COLOR_MVFR,
+    "IFR": config.COLOR_IFR,
+    "LIFR": config.COLOR_LIFR,
+}
+
+
 def get_base_color_for_category(cat):
-    if cat == "VFR":
-        return config.COLOR_VFR
-    elif cat == "MVFR":
-        return config.COLOR_MVFR
-    elif cat == "IFR":
-        return config.COLOR_IFR
-    elif cat == "LIFR":
-        return config.COLOR_LIFR
-    else:
-        return config.COLOR_UNKNOWN
+    return _CAT_COLOR.get(cat, config.COLOR_UNKNOWN)
 
 
-def apply_brightness_to_color(color, brightness):
-    r, g, b = color
-    return (
-        int(r * brightness),
-        int(g * brightness),
-        int(b * brightness),
-    )
+# Reusable 3-byte scratch for scaled colors. Building a tuple or bytes per
+# flash bumps the GC; filling this in place allocates nothing. GRB order is
+# baked in to match the WS2812 buffer layout.
+_scratch = bytearray(3)
 
 
-def show_static_color(color):
-    for i in range(config.LED_COUNT):
-        np[i] = color
+def _scale_color_grb(color, brightness, out=_scratch):
+    out[0] = int(color[1] * brightness)
+    out[1] = int(color[0] * brightness)
+    out[2] = int(color[2] * brightness)
+    return out
+
+
+# Premultiplied color table: (category, brightness bucket 0..63) -> GRB
+# triplet, built once at import. The steady-state frame then reduces to a
+# dict lookup and a buffer fill with no per-frame float->int color scaling.
+_BRIGHTNESS_BUCKETS = 64
+_COLOR_TABLE = {}
+
+
+def _build_color_table():
+    _COLOR_TABLE.clear()
+    for cat in ("VFR", "MVFR", "IFR", "LIFR", "UNKNOWN"):
+        r, g, b = get_base_color_for_category(cat)
+        for bucket in range(_BRIGHTNESS_BUCKETS):
+            scale = bucket / (_BRIGHTNESS_BUCKETS - 1)
+            _COLOR_TABLE[(cat, bucket)] = bytes(
+                (int(g * scale), int(r * scale), int(b * scale))
+            )
+
+
+_build_color_table()
+
+
+# Pre-rolled lightning randomness. random.random() allocates a float every
+# frame just to roll the flash dice; instead compare one pre-fetched random
+# byte per frame against LIGHTNING_FREQUENCY scaled to 0-255, refilling the
+# byte pool in bulk from os.urandom. Flash targets cycle through a
+# Fisher-Yates shuffle of the ring done up front, replacing per-flash
+# randint calls.
+_LTG_THRESHOLD = min(255, int(_LIGHTNING_FREQUENCY * 256))
+_ltg_bytes = bytearray(32)
+_ltg_pos = len(_ltg_bytes)  # force a refill on first use
+
+
+def _shuffled_led_order():
+    order = list(range(_LED_COUNT))
+    for i in range(_LED_COUNT - 1, 0, -1):
+        j = random.randint(0, i)
+        order[i], order[j] = order[j], order[i]
+    return order
+
+
+_flash_order = _shuffled_led_order()
+_flash_pos = 0
+
+
+# Cached fill pattern so frames with an unchanged color skip rebuilding the
+# whole-ring byte string. The NeoPixel buffer is GRB order.
+_fill_key = None
+_fill_pattern = b""
+
+
+def _fill_ring(triplet):
+    global _fill_key, _fill_pattern
+    if triplet != _fill_key:
+        _fill_key = triplet
+        _fill_pattern = triplet * _LED_COUNT
+    np.buf[:] = _fill_pattern
+
+
+def _write_if_changed():
+    # Transmitting costs ~30us per LED with interrupts off; don't pay it
+    # for a frame that is byte-identical to what the ring already shows.
+    if np.buf == _last_buf:
+        return
+    _last_buf[:] = np.buf
     np.write()
 
 
-def animate_frame():
+def show_static_color(color):
+    r, g, b = color
+    _fill_ring(bytes((g, r, b)))
+    _write_if_changed()
+
+
+def animate_frame(_ticks_ms=time.ticks_ms):
     """
     Called frequently in the main loop to update the ring based on
     current METAR state and time of day.
+
+    The default arg binds ticks_ms so MicroPython resolves it as a
+    local instead of a global+attribute lookup each frame.
     """
-    base_color = get_base_color_for_category(flight_category)
+    global _ltg_pos, _flash_pos
+
     base_brightness = current_brightness()
 
     # Start from base brightness
     brightness = base_brightness
 
-    # Gust breathing: modulate brightness slowly if gusts present
-    if config.ENABLE_GUST_BREATHING and has_gusts:
-        now = time.ticks_ms() / 1000.0
-
-        # Base sine phase 0..1
-        raw = (math.sin(
-            2 * math.pi * now / config.GUST_BREATH_PERIOD_SEC
-        ) + 1.0) / 2.0
-
-        # Ease-in-out curve: slows down near extremes so steps are less visible
-        # You can play with the exponent; 2.0–3.0 is usually nice.
-        eased = raw ** 2.5
-
-        span = config.GUST_BREATH_MAX - config.GUST_BREATH_MIN
-        breath_factor = config.GUST_BREATH_MIN + span * eased
-
+    # Gust breathing: modulate brightness slowly if gusts present.
+    # The ease-in-out sine curve is baked into _BREATH_LUT at import time,
+    # so each frame is just a table index instead of sin() + pow().
+    if _ENABLE_GUST_BREATHING and has_gusts:
+        breath_factor = _BREATH_LUT[(_ticks_ms() // _BREATH_STEP_MS) & 63] / 255.0
         brightness = base_brightness * breath_factor
     else:
         brightness = base_brightness
 
-
-    # Apply brightness to base color
-    r, g, b = apply_brightness_to_color(base_color, brightness)
+    # Bucketing to 64 brightness steps keeps the color table small and also
+    # makes consecutive breathing frames byte-identical (transmit skipped).
+    bucket = int(brightness * (_BRIGHTNESS_BUCKETS - 1))
 
     # NOTE: we no longer tint high winds toward yellow.
     # HIGH_WIND_THRESHOLD_KT is available if you want special behavior later.
 
-    # Fill the ring with the (possibly breathing) color
-    for i in range(config.LED_COUNT):
-        np[i] = (r, g, b)
+    # Fill the ring with the (possibly breathing) color in one buffer write
+    triplet = _COLOR_TABLE.get((flight_category, bucket))
+    if triplet is None:
+        triplet = _COLOR_TABLE[("UNKNOWN", bucket)]
+    _fill_ring(triplet)
 
     # Lightning flashes: occasionally overlay bright white flashes
-    if config.ENABLE_LIGHTNING_EFFECT and has_lightning:
-        if random.random() < config.LIGHTNING_FREQUENCY:
-            flash_count = max(1, config.LED_COUNT // 4)
+    if _ENABLE_LIGHTNING_EFFECT and has_lightning:
+        if _ltg_pos >= 32:
+            _ltg_bytes[:] = os.urandom(32)
+            _ltg_pos = 0
+        roll = _ltg_bytes[_ltg_pos]
+        _ltg_pos += 1
+        if roll < _LTG_THRESHOLD:
+            # One shared flash triplet in the scratch buffer (white, so GRB
+            # order is moot); each flashed LED is a three-byte slice write.
+            flash_triplet = _scale_color_grb(
+                (255, 255, 255), _LIGHTNING_BRIGHTNESS * brightness
+            )
+            flash_count = max(1, _LED_COUNT // 4)
             for _ in range(flash_count):
-                idx = random.randint(0, config.LED_COUNT - 1)
-                np[idx] = apply_brightness_to_color((255 * config.LIGHTNING_BRIGHTNESS,
-                                                     255 * config.LIGHTNING_BRIGHTNESS,
-                                                     255 * config.LIGHTNING_BRIGHTNESS), brightness)
+                idx = _flash_order[_flash_pos]
+                _flash_pos += 1
+                if _flash_pos >= _LED_COUNT:
+                    _flash_pos = 0
+                np.buf[idx * 3:idx * 3 + 3] = flash_triplet
 
-    np.write()
+    _write_if_changed()
 
 
 # ===== Main =====
@@ -494,34 +974,69 @@ def main():
     if not wlan.isconnected():
         # Flash red forever
         while True:
-            for i in range(config.LED_COUNT):
-                np[i] = (50, 0, 0)
-            np.write()
+            show_static_color((50, 0, 0))
             time.sleep(0.5)
             show_static_color((0, 0, 0))
             time.sleep(0.5)
 
     sync_time()
     update_sun_times()
-    update_metar_state()
 
-    frame_delay = 0.02  # seconds between animation frames
+    # Seed from the on-flash cache if the last report is still inside the
+    # update interval; otherwise fetch fresh (the cache still primes the
+    # If-Modified-Since header for the first fetch).
+    fetch_needed = True
+    if _load_metar_cache():
+        age = int(time.time()) - _cached_metar_time
+        if 0 <= age < config.UPDATE_INTERVAL_SECONDS:
+            log("Using cached METAR ({}s old)".format(age))
+            apply_metar_state(_cached_metar_text)
+            last_metar_update = time.ticks_add(time.ticks_ms(), -age * 1000)
+            fetch_needed = False
+    if fetch_needed:
+        update_metar_state()
+
+    # If the boot-time fetches failed, retry on the normal interval rather
+    # than hammering the network every frame.
+    if last_metar_update == 0:
+        last_metar_update = time.ticks_ms()
+    if last_sun_update == 0:
+        last_sun_update = time.ticks_ms()
+
+    frame_ms = 20  # milliseconds between animation frames
+    next_frame = time.ticks_ms()
+
+    # The refresh intervals are minutes to hours, so checking them on every
+    # 20ms frame is wasted clock reads; re-evaluate about once a second.
+    slow_tick_frames = 1000 // frame_ms
+    slow_tick = 0
 
     while True:
-        now = time.time()
+        slow_tick += 1
+        if slow_tick >= slow_tick_frames:
+            slow_tick = 0
+            now = time.ticks_ms()
 
-        # Refresh sun times periodically
-        if config.USE_SUN_TIMES and (now - last_sun_update) > config.SUN_TIMES_REFRESH_SECONDS:
-            update_sun_times()
+            # Refresh sun times periodically
+            if _USE_SUN_TIMES and time.ticks_diff(now, last_sun_update) > _SUN_REFRESH_MS:
+                update_sun_times()
 
-        # Refresh METAR periodically
-        if (now - last_metar_update) > config.UPDATE_INTERVAL_SECONDS:
-            update_metar_state()
+            # Refresh METAR periodically
+            if time.ticks_diff(now, last_metar_update) > _UPDATE_INTERVAL_MS:
+                update_metar_state()
 
         # Update LED animation
         animate_frame()
 
-        time.sleep(frame_delay)
+        # Sleep against an absolute deadline so variable frame cost doesn't
+        # accumulate drift.
+        next_frame = time.ticks_add(next_frame, frame_ms)
+        delay = time.ticks_diff(next_frame, time.ticks_ms())
+        if delay > 0:
+            time.sleep_ms(delay)
+        else:
+            # Fell badly behind (e.g. a network refresh); restart the schedule.
+            next_frame = time.ticks_ms()
 
 
 # Run main if this file is executed directly